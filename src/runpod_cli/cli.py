@@ -1,21 +1,32 @@
+from __future__ import annotations
+
+import atexit
+import codecs
+import email.utils
+import functools
+import hashlib
+import io
+import json
 import logging
 import os
+import random
 import re
-import textwrap
+import shlex
+import tarfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import boto3
-import fire
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 try:
     from .utils import (
         DEFAULT_IMAGE_NAME,
         GPU_DISPLAY_NAME_TO_ID,
-        GPU_ID_TO_DISPLAY_NAME,
+        get_gpu_display_name,
         get_setup_root,
         get_setup_user,
         get_start,
@@ -25,40 +36,332 @@ except ImportError:
     from utils import (  # type: ignore
         DEFAULT_IMAGE_NAME,
         GPU_DISPLAY_NAME_TO_ID,
-        GPU_ID_TO_DISPLAY_NAME,
+        get_gpu_display_name,
         get_setup_root,
         get_setup_user,
         get_start,
         get_terminate,
     )
 
-logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(asctime)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+logger = logging.getLogger("runpod_cli")
+
+# Shared HTTP session so repeated RunPod API calls reuse pooled keep-alive connections.
+# Retries are left to retry_with_backoff so requests are not retried twice.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+atexit.register(_SESSION.close)
+REQUEST_TIMEOUT = 10  # seconds
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _raise_for_retryable_status(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+    # The runpod SDK never calls raise_for_status, so a 429/5xx would otherwise surface as a JSON decode error
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        response.raise_for_status()
+
+
+_SESSION.hooks["response"].append(_raise_for_retryable_status)
+
+
+# Pod entrypoint: run the start script, keep the pod alive for the requested runtime, then terminate it
+# The pod scripts are uploaded as a single tar archive and unpacked before anything runs. If the extract fails
+# (e.g. an image without tar), start_pod.sh is skipped rather than running stale scripts from an earlier pod
+SCRIPTS_ARCHIVE = "scripts.tar"
+DOCKER_COMMAND_TEMPLATE = (
+    "mkdir -p {path} && tar -xf {path}/" + SCRIPTS_ARCHIVE + " -C {path} && bash {path}/start_pod.sh; sleep {seconds}; bash {path}/terminate_pod.sh"
+)
+
+# Host key files copied to the scripts directory by start_pod.sh
+HOST_KEY_FILES = ["ssh_ed25519_host_key", "ssh_ecdsa_host_key", "ssh_rsa_host_key", "ssh_dsa_host_key"]
+
+# Characters replaced by "_" when turning a pod name into the scripts directory name
+_UNSAFE_NAME_CHARS_RE = re.compile(r"[^\w.-]", re.ASCII)
+
+# Jupyter over the RunPod HTTP proxy and SSH over a public TCP port
+POD_PORTS = "8888/http,22/tcp"
+
+# Pod runtime (sleep seconds) from dockerArgs and start time from lastStatusChange
+_SLEEP_RE = re.compile(r"\bsleep\s+(\d+)\b")
+_DATE_RE = re.compile(
+    r":\s*\w{3}\s+(?P<month>\w{3})\s+(?P<day>\d{2})\s+(?P<year>\d{4})\s+(?P<hour>\d{2}):(?P<minute>\d{2}):(?P<second>\d{2})\s+GMT"
+)
+_MONTHS = {month: i for i, month in enumerate(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], start=1)}
+
+# Lowercased (id, name, id) triples for fuzzy GPU matching, built once at import
+_GPU_LC_INDEX = [(gpu_id.lower(), gpu_name.lower(), gpu_id) for gpu_name, gpu_id in GPU_DISPLAY_NAME_TO_ID.items()]
+
+PODS_CACHE_TTL = 5  # seconds
+# Only what `list` displays is cached on disk; in particular each pod's `env` (often holding tokens) is dropped
+POD_CACHE_FIELDS = (
+    "id",
+    "name",
+    "lastStatusChange",
+    "dockerArgs",
+    "runtime",
+    "machine",
+    "gpuCount",
+    "memoryInGb",
+    "vcpuCount",
+    "containerDiskInGb",
+    "volumeMountPath",
+    "costPerHr",
+)
+
+SSH_CONFIG_TEMPLATE = (
+    "Host runpod\n"
+    "  HostName {ip}\n"
+    "  User user\n"
+    "  Port {port}\n"
+    "  UserKnownHostsFile ~/.ssh/known_hosts ~/.ssh/known_hosts.runpod_cli"
+    "{forward_agent}"
+)
+
+
+def get_graphql_url() -> str:
+    # Same endpoint as the runpod SDK, which honours RUNPOD_API_BASE_URL
+    return f"{os.environ.get('RUNPOD_API_BASE_URL', 'https://api.runpod.io')}/graphql"
+
+
+# Only the fields needed to detect readiness and connect over SSH
+POD_RUNTIME_QUERY = """
+query Pod($podId: String!) {
+    pod(input: {podId: $podId}) {
+        id
+        runtime {
+            ports {
+                ip
+                isIpPublic
+                privatePort
+                publicPort
+                type
+            }
+        }
+    }
+}
+"""
+
+POD_TERMINATE_MUTATION = """
+mutation PodTerminate($podId: String!) {
+    podTerminate(input: {podId: $podId})
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def expanduser(path: str) -> str:
+    """os.path.expanduser, memoized so the home directory is only resolved once per path."""
+    return os.path.expanduser(path)
+
+
+def get_cache_dir() -> str:
+    xdg_cache_dir = os.environ.get("XDG_CACHE_HOME", expanduser("~/.cache"))
+    return os.path.join(xdg_cache_dir, "runpod_cli")
+
+
+@functools.lru_cache(maxsize=32)
+def get_region_from_volume_id(volume_id: str, api_key: str) -> str:
+    # The data center of a network volume never changes, so cache it on disk across invocations
+    cache_path = os.path.join(get_cache_dir(), "volume_region.json")
+    try:
+        with open(cache_path) as f:
+            volume_regions = json.load(f)
+    except (OSError, ValueError):
+        volume_regions = {}
+    if volume_regions.get(volume_id):
+        return volume_regions[volume_id]
 
-import runpod  # noqa: E402
-
-
-def get_region_from_volume_id(volume_id: str) -> str:
-    api_key = os.getenv("RUNPOD_API_KEY")
     url = f"https://rest.runpod.io/v1/networkvolumes/{volume_id}"
     headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers)
+    response = _SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
     if response.status_code != 200:
         raise ValueError(f"Failed to get volume info: {response.text}")
     volume_info = response.json()
-    return volume_info.get("dataCenterId")
+    data_center_id = volume_info.get("dataCenterId")
+
+    if data_center_id:
+        volume_regions[volume_id] = data_center_id
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, "w") as f:
+                json.dump(volume_regions, f)
+        except OSError as e:
+            logger.warning("Could not write volume region cache %s: %s", cache_path, e)
+    return data_center_id
 
 
-def get_s3_endpoint_from_volume_id(volume_id: str) -> str:
-    data_center_id = get_region_from_volume_id(volume_id)
+def get_s3_endpoint_from_data_center_id(data_center_id: str) -> str:
     s3_endpoint = f"https://s3api-{data_center_id.lower()}.runpod.io/"
     return s3_endpoint
 
 
-def getenv(key: str) -> str:
-    value = os.getenv(key)
-    if not value:
-        raise ValueError(f"{key} not found in environment. Set it in your .env file.")
-    return value
+@functools.lru_cache(maxsize=None)
+def load_env(env: Optional[str] = None) -> None:
+    """Load the .env file into os.environ, once per process and path."""
+    from dotenv import dotenv_values
+
+    if env:
+        logger.info("Using .env file: %s", env)
+        dotenv_path = expanduser(env)
+        if not os.path.exists(dotenv_path):
+            raise FileNotFoundError(f"Specified .env file not found: {dotenv_path}")
+    else:
+        xdg_config_dir = os.environ.get("XDG_CONFIG_HOME", expanduser("~/.config"))
+        env_paths = [".env", os.path.join(xdg_config_dir, "runpod_cli/.env")]
+        found = [path for path in env_paths if os.path.exists(path)]
+        if not found:
+            raise FileNotFoundError(f"No .env file found in {env_paths}")
+        if len(found) > 1:
+            raise FileExistsError(f"Multiple .env files found in {env_paths}")
+        dotenv_path = found[0]
+    # Equivalent to load_dotenv(override=True); keys declared without a value are skipped
+    os.environ.update({key: value for key, value in dotenv_values(dotenv_path).items() if value is not None})
+
+
+def getenv(*keys: str) -> Tuple[str, ...]:
+    values = tuple(os.environ.get(key) for key in keys)
+    missing = [key for key, value in zip(keys, values) if not value]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} not found in environment. Set them in your .env file.")
+    return values
+
+
+def _public_port_entry(pod: Dict) -> Optional[Dict]:
+    ports = (pod.get("runtime") or {}).get("ports") or []
+    return next((port for port in ports if port.get("isIpPublic")), None)
+
+
+def _is_transient(e: requests.RequestException) -> bool:
+    """Connection problems, timeouts and 429/5xx responses are worth retrying; anything else (401, 404, ...) is not."""
+    if isinstance(e, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return isinstance(e, requests.HTTPError) and e.response is not None and e.response.status_code in RETRYABLE_STATUS_CODES
+
+
+def poll_with_backoff(
+    fn: Callable[[], Any],
+    ready: Callable[[Any], bool],
+    base: float = 0.5,
+    factor: float = 2.0,
+    cap: float = 30.0,
+    max_total: float = 600.0,
+    jitter: float = 0.5,
+) -> Any:
+    """Call `fn` until `ready(result)` holds, sleeping with jittered exponential backoff in between.
+
+    Transient HTTP errors count as a failed attempt; permanent ones (e.g. 401, 404) are raised immediately. Raises
+    TimeoutError once `max_total` seconds have passed.
+    """
+    deadline = time.monotonic() + max_total
+    attempt = 0
+    while True:
+        try:
+            result = fn()
+            if ready(result):
+                return result
+        except requests.RequestException as e:
+            if not _is_transient(e):
+                raise
+            logger.debug("Poll attempt %d failed: %s", attempt + 1, e)
+        delay = min(cap, base * factor**attempt) * random.uniform(1 - jitter, 1 + jitter)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Condition not met after {max_total} seconds")
+        logger.debug("Not ready yet, polling again in %.1fs", delay)
+        time.sleep(min(delay, remaining))
+        attempt += 1
+
+
+# Reset headers larger than this are Unix timestamps rather than delays (10**9 s is ~31 years)
+_EPOCH_THRESHOLD = 10**9
+
+
+def _retry_after_seconds(response: Optional[requests.Response], cap: float = 30.0) -> Optional[float]:
+    """Seconds the server asked us to wait, from Retry-After (seconds or HTTP date) or the rate-limit reset headers.
+
+    The result is clamped to `cap` so a bogus or far-future header cannot stall the CLI.
+    """
+    if response is None:
+        return None
+    delay: Optional[float] = None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            try:
+                retry_at = email.utils.parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                retry_at = None
+            if retry_at is not None:
+                if retry_at.tzinfo is None:
+                    retry_at = retry_at.replace(tzinfo=timezone.utc)
+                delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    if delay is None and response.headers.get("x-ratelimit-remaining-requests") == "0":
+        reset = response.headers.get("x-ratelimit-reset-requests") or response.headers.get("x-ratelimit-reset")
+        try:
+            delay = float(reset) if reset else None
+        except ValueError:
+            delay = None
+        if delay is not None and delay > _EPOCH_THRESHOLD:
+            delay -= time.time()
+    if delay is None:
+        return None
+    return min(cap, max(0.0, delay))
+
+
+def _is_rate_limit_query_error(e: Exception) -> bool:
+    # runpod.error.QueryError carries no status code; matched by name so the SDK need not be imported here
+    return type(e).__name__ == "QueryError" and any(phrase in str(e).lower() for phrase in ("rate limit", "too many requests"))
+
+
+def retry_with_backoff(max_retries: int = 3, base: float = 1.0, cap: float = 30.0, jitter: float = 0.5) -> Callable:
+    """Retry the decorated function on connection errors, timeouts, HTTP 429/5xx responses and rate-limit QueryErrors.
+
+    Waits for the server's Retry-After if given, otherwise uses jittered exponential backoff. Other HTTP errors
+    (400, 401, 404, ...) are raised immediately.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            for attempt in range(max_retries + 1):
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    retryable = _is_transient(e) if isinstance(e, requests.RequestException) else _is_rate_limit_query_error(e)
+                    if attempt == max_retries or not retryable:
+                        raise
+                    delay = _retry_after_seconds(getattr(e, "response", None), cap=cap)
+                    if delay is None:
+                        delay = min(cap, base * 2**attempt) * random.uniform(1 - jitter, 1 + jitter)
+                    logger.warning("RunPod API request failed (%s), retrying in %.1fs", e, delay)
+                    time.sleep(delay)
+
+        return wrapper
+
+    return decorator
+
+
+class TokenBucket:
+    """Token bucket allowing bursts of up to `requests_per_minute` calls, refilled continuously."""
+
+    def __init__(self, requests_per_minute: float) -> None:
+        self._rate = requests_per_minute
+        self._tokens = requests_per_minute
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._rate, self._tokens + (now - self._last) * self._rate / 60)
+            self._last = now
+            if self._tokens < 1:
+                time.sleep((1 - self._tokens) * 60 / self._rate)
+                self._tokens = 1
+                self._last = time.monotonic()
+            self._tokens -= 1
 
 
 class RunPodManager:
@@ -80,79 +383,131 @@ class RunPodManager:
     """
 
     def __init__(self, env: Optional[str] = None) -> None:
-        if env:
-            logging.info(f"Using .env file: {env}")
-            env_path = os.path.expanduser(env)
-            if not os.path.exists(env_path):
-                raise FileNotFoundError(f"Specified .env file not found: {env_path}")
-            load_dotenv(override=True, dotenv_path=env_path)
-        else:
-            xdg_config_dir = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
-            env_paths = [".env", os.path.join(xdg_config_dir, "runpod_cli/.env")]
-            env_exists = [os.path.exists(os.path.expanduser(path)) for path in env_paths]
-            if not any(env_exists):
-                raise FileNotFoundError(f"No .env file found in {env_paths}")
-            if env_exists.count(True) > 1:
-                raise FileExistsError(f"Multiple .env files found in {env_paths}")
-            load_dotenv(override=True, dotenv_path=os.path.expanduser(env_paths[env_exists.index(True)]))
-
-        runpod.api_key = getenv("RUNPOD_API_KEY")
-        self._network_volume_id: str = getenv("RUNPOD_NETWORK_VOLUME_ID")
-        s3_access_key_id = getenv("RUNPOD_S3_ACCESS_KEY_ID")
-        s3_secret_key = getenv("RUNPOD_S3_SECRET_KEY")
-        self._region = get_region_from_volume_id(self._network_volume_id)
-        s3_endpoint_url = get_s3_endpoint_from_volume_id(self._network_volume_id)
-        self._s3 = boto3.client(
+        load_env(env)
+        self._api_key, self._network_volume_id, self._s3_access_key_id, self._s3_secret_key = getenv(
+            "RUNPOD_API_KEY", "RUNPOD_NETWORK_VOLUME_ID", "RUNPOD_S3_ACCESS_KEY_ID", "RUNPOD_S3_SECRET_KEY"
+        )
+        self._rate_limiter = TokenBucket(requests_per_minute=self._requests_per_minute())
+        # Optional settings used by create(), read once alongside the required ones
+        self._user = os.getenv("USER")
+        self._git_email = os.getenv("GIT_EMAIL", "")
+        self._git_name = os.getenv("GIT_NAME", "")
+
+    @staticmethod
+    def _requests_per_minute() -> float:
+        value = os.getenv("RUNPOD_RPM") or "60"
+        try:
+            rpm = float(value)
+        except ValueError:
+            rpm = float("nan")
+        if not (0 < rpm < float("inf")):
+            raise ValueError(f"RUNPOD_RPM must be a number greater than 0, got {value!r}")
+        return rpm
+
+    # The runpod SDK and boto3 are slow to import, so load them only once a command needs them
+    @functools.cached_property
+    def _runpod(self):
+        import runpod
+        import runpod.api.graphql
+
+        if getattr(runpod, "api_key", None) != self._api_key:
+            runpod.api_key = self._api_key
+        # The SDK calls requests.post for every GraphQL query; route those through the shared session as well
+        runpod.api.graphql.requests = _SESSION
+        return runpod
+
+    # The region lookup and S3 client are only needed by `create`, so `list` and `terminate` skip them
+    @functools.cached_property
+    def _region(self) -> str:
+        return get_region_from_volume_id(self._network_volume_id, self._api_key)
+
+    @functools.cached_property
+    def _s3(self):
+        import boto3
+        from botocore.config import Config
+
+        return boto3.client(
             "s3",
-            aws_access_key_id=s3_access_key_id,
-            aws_secret_access_key=s3_secret_key,
-            endpoint_url=s3_endpoint_url,
+            aws_access_key_id=self._s3_access_key_id,
+            aws_secret_access_key=self._s3_secret_key,
+            endpoint_url=get_s3_endpoint_from_data_center_id(self._region),
             region_name=self._region,
+            config=Config(tcp_keepalive=True, max_pool_connections=32, retries={"max_attempts": 3, "mode": "adaptive"}),
         )
 
+    def _runpod_call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # All RunPod API calls go through the rate limiter to avoid hitting the account's request limits
+        self._rate_limiter.acquire()
+        return fn(*args, **kwargs)
+
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict:
+        headers = {"Authorization": f"Bearer {self._api_key}"}
+        response = _SESSION.post(get_graphql_url(), headers=headers, json={"query": query, "variables": variables}, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        result = response.json()
+        if "errors" in result:
+            raise self._runpod.error.QueryError(result["errors"][0]["message"], query)
+        return result["data"]
+
+    def _get_pod_runtime(self, pod_id: str) -> Dict:
+        # Queried directly over the shared session: the provisioning loop calls this many times
+        return self._graphql(POD_RUNTIME_QUERY, {"podId": pod_id})["pod"]
+
+    @retry_with_backoff()
+    def _runpod_query(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # Only for idempotent one-shot requests: a retried create_pod could create a second pod, and polling loops
+        # already retry on their own
+        return self._runpod_call(fn, *args, **kwargs)
+
     def _build_docker_args(self, volume_mount_path: str, runpodcli_dir: str, runtime: int) -> str:
+        # The runpod SDK inlines dockerArgs into a GraphQL string literal without escaping, so the command must not
+        # contain quotes or backslashes beyond the outer single quotes: both path components are validated plain tokens
         runpodcli_path = f"{volume_mount_path}/{runpodcli_dir}"
-        return (
-            "/bin/bash -c '"
-            + (f"mkdir -p {runpodcli_path}; bash {runpodcli_path}/start_pod.sh; sleep {max(runtime * 60, 20)}; bash {runpodcli_path}/terminate_pod.sh")
-            + "'"
-        )
-
-    def _provision_and_wait(self, pod_id: str, n_attempts: int = 60) -> Dict:
-        for _ in range(n_attempts):
-            pod = runpod.get_pod(pod_id)
-            pod_runtime = pod.get("runtime")
-            if pod_runtime is None or not pod_runtime.get("ports"):
-                time.sleep(5)
-            else:
-                return pod
-        raise RuntimeError("Pod provisioning failed")
+        if shlex.quote(runpodcli_path) != runpodcli_path:
+            raise ValueError(f"Scripts path {runpodcli_path!r} must not contain spaces, quotes or other shell metacharacters")
+        command = DOCKER_COMMAND_TEMPLATE.format(path=runpodcli_path, seconds=max(runtime * 60, 20))
+        return f"/bin/bash -c {shlex.quote(command)}"
+
+    def _provision_and_wait(self, pod_id: str, timeout: float = 600) -> Dict:
+        try:
+            return poll_with_backoff(
+                # poll_with_backoff already absorbs transient errors; retrying inside a poll would overshoot max_total
+                lambda: self._runpod_call(self._get_pod_runtime, pod_id),
+                lambda pod: bool(pod and (pod.get("runtime") or {}).get("ports")),
+                # Pods typically come up within 10-60s; a low cap keeps detection latency close to a fixed 5s poll
+                cap=10.0,
+                max_total=timeout,
+            )
+        except TimeoutError as e:
+            raise RuntimeError("Pod provisioning failed") from e
 
     def _get_public_ip_and_port(self, pod: Dict) -> Tuple[str, int]:
-        public_ips = [i for i in pod["runtime"]["ports"] if i["isIpPublic"]]
-        if len(public_ips) != 1:
-            raise ValueError(f"Expected 1 public IP, got {public_ips}")
-        ip = public_ips[0].get("ip")
-        port = public_ips[0].get("publicPort")
+        public_port = _public_port_entry(pod)
+        if public_port is None:
+            raise ValueError(f"Expected a public IP, got none for pod {pod.get('id')}")
+        ip = public_port.get("ip")
+        port = public_port.get("publicPort")
         if not ip or port is None:
-            raise ValueError(f"Expected public IP and port, got {ip} and {port} from {public_ips}")
+            raise ValueError(f"Expected public IP and port, got {ip} and {port} from {public_port}")
         return str(ip), int(port)
 
     def _parse_time_remaining(self, pod: Dict) -> str:
-        _sleep_re = re.compile(r"\bsleep\s+(\d+)\b")
-        _date_re = re.compile(r":\s*(\w{3}\s+\w{3}\s+\d{2}\s+\d{4}\s+\d{2}:\d{2}:\d{2})\s+GMT")
         start_dt = None
         sleep_secs = None
-        last_status_change = pod.get("lastStatusChange", "")
-        if isinstance(last_status_change, str):
-            match = _date_re.search(last_status_change)
-            if match:
-                start_dt = datetime.strptime(match.group(1), "%a %b %d %Y %H:%M:%S").replace(tzinfo=timezone.utc)
-        docker_args = pod.get("dockerArgs", "")
-        if isinstance(docker_args, str):
-            match = _sleep_re.search(docker_args)
-            if match:
-                sleep_secs = int(match.group(1))
+        match = _DATE_RE.search(pod.get("lastStatusChange") or "")
+        if match and match.group("month") in _MONTHS:
+            start_dt = datetime(
+                int(match.group("year")),
+                _MONTHS[match.group("month")],
+                int(match.group("day")),
+                int(match.group("hour")),
+                int(match.group("minute")),
+                int(match.group("second")),
+                tzinfo=timezone.utc,
+            )
+        match = _SLEEP_RE.search(pod.get("dockerArgs") or "")
+        if match:
+            sleep_secs = int(match.group(1))
         if start_dt is not None and sleep_secs is not None:
             now_dt = datetime.now(timezone.utc)
             shutdown_dt = start_dt + timedelta(seconds=sleep_secs)
@@ -165,47 +520,92 @@ class RunPodManager:
 
     def _get_gpu_id(self, gpu_type: str | int) -> Tuple[str, str]:
         gpu_type = str(gpu_type)
-        if gpu_type in GPU_DISPLAY_NAME_TO_ID:
+        exact_id = GPU_DISPLAY_NAME_TO_ID.get(gpu_type)
+        exact_name = get_gpu_display_name(gpu_type) if exact_id is None else None
+        if exact_id is not None:
             # A name was passed
-            gpu_id = GPU_DISPLAY_NAME_TO_ID[gpu_type]
+            gpu_id = exact_id
             gpu_name = gpu_type
-        elif gpu_type in GPU_ID_TO_DISPLAY_NAME:
+        elif exact_name is not None:
             # An ID was passed
             gpu_id = gpu_type
-            gpu_name = GPU_ID_TO_DISPLAY_NAME[gpu_id]
+            gpu_name = exact_name
         else:
             # Attempt fuzzy matching, but only if unique
-            matches = [gpu_id for gpu_name, gpu_id in GPU_DISPLAY_NAME_TO_ID.items() if gpu_type.lower() in gpu_id.lower() or gpu_type.lower() in gpu_name.lower()]
+            query = gpu_type.lower()
+            matches = [gpu_id for gpu_id_lc, gpu_name_lc, gpu_id in _GPU_LC_INDEX if query in gpu_id_lc or query in gpu_name_lc]
             if len(matches) == 1:
                 gpu_id = matches[0]
-                gpu_name = GPU_ID_TO_DISPLAY_NAME[gpu_id]
+                gpu_name = get_gpu_display_name(gpu_id)
             elif len(matches) > 1:
                 raise ValueError(f"Ambiguous GPU type: {gpu_type} matches {matches}. Please use a full name or ID from https://docs.runpod.io/references/gpu-types")
             else:
                 raise ValueError(f"Unknown GPU type: {gpu_type}")
         return gpu_id, gpu_name
 
-    def list(self, verbose: bool = False) -> None:
+    @property
+    def _pods_cache_path(self) -> str:
+        api_key_hash = hashlib.sha256(self._api_key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(get_cache_dir(), f"pods_{api_key_hash}.json")
+
+    def _get_pods(self, use_cache: bool = True) -> List[Dict]:
+        # Repeated `rpc list` calls (e.g. while waiting for a pod) within PODS_CACHE_TTL reuse the last response
+        cache_path = self._pods_cache_path
+        if use_cache:
+            try:
+                if time.time() - os.path.getmtime(cache_path) < PODS_CACHE_TTL:
+                    with open(cache_path) as f:
+                        return json.load(f)
+            except (OSError, ValueError):
+                pass
+        pods = [{key: pod[key] for key in POD_CACHE_FIELDS if key in pod} for pod in self._runpod_query(self._runpod.get_pods)]
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                # The mode above only applies to newly created files
+                os.chmod(cache_path, 0o600)
+                json.dump(pods, f)
+        except OSError as e:
+            logger.debug("Could not write pods cache %s: %s", cache_path, e)
+        return pods
+
+    def _invalidate_pods_cache(self) -> None:
+        try:
+            os.remove(self._pods_cache_path)
+        except OSError:
+            pass
+
+    def _format_pod(self, index: int, pod: Dict, verbose: bool = False) -> str:
+        lines = [
+            f"Pod {index + 1}:",
+            f"  ID: {pod.get('id')}",
+            f"  Name: {pod.get('name')}",
+            f"  Time remaining (est.): {self._parse_time_remaining(pod)}",
+        ]
+        if verbose:
+            try:
+                public_ip, public_port = self._get_public_ip_and_port(pod)
+            except ValueError:
+                # e.g. a pod that is still provisioning or has exited
+                public_ip, public_port = "-", "-"
+            machine = pod.get("machine") or {}
+            lines.append(f"  Public IP: {public_ip}")
+            lines.append(f"  Public port: {public_port}")
+            lines.append(f"  GPUs: {pod.get('gpuCount')} x {machine.get('gpuDisplayName')}")
+            lines.extend(f"  {key}: {pod.get(key)}" for key in ["memoryInGb", "vcpuCount", "containerDiskInGb", "volumeMountPath", "costPerHr"])
+        lines.append("")
+        return "\n".join(lines)
+
+    def list(self, verbose: bool = False, no_cache: bool = False) -> None:
         """List all pods in your RunPod account.
 
         Displays information about each pod including ID, name, GPU type, status, and connection details.
+        Results are cached for a few seconds; pass --no_cache to always query the API.
         """
-        pods = runpod.get_pods()  # type: ignore
-
-        for i, pod in enumerate(pods):
-            logging.info(f"Pod {i + 1}:")
-            logging.info(f"  ID: {pod.get('id')}")
-            logging.info(f"  Name: {pod.get('name')}")
-            time_remaining = self._parse_time_remaining(pod)
-            logging.info(f"  Time remaining (est.): {time_remaining}")
-            if verbose:
-                public_ip, public_port = self._get_public_ip_and_port(pod)
-                logging.info(f"  Public IP: {public_ip}")
-                logging.info(f"  Public port: {public_port}")
-                logging.info(f"  GPUs: {pod.get('gpuCount')} x {pod.get('machine', {}).get('gpuDisplayName')}")
-                for key in ["memoryInGb", "vcpuCount", "containerDiskInGb", "volumeMountPath", "costPerHr"]:
-                    logging.info(f"  {key}: {pod.get(key)}")
-            logging.info("")
+        pods = self._get_pods(use_cache=not no_cache)
+
+        if pods and logger.isEnabledFor(logging.INFO):
+            logger.info("%s", "\n".join(self._format_pod(i, pod, verbose) for i, pod in enumerate(pods)))
 
     def create(
         self,
@@ -243,39 +643,40 @@ class RunPodManager:
             rpc create --gpu_type="RTX A4000" --runtime=480
         """
         gpu_id, gpu_name = self._get_gpu_id(gpu_type)
-        name = name or f"{os.getenv('USER')}-{gpu_name}"
-        runpodcli_dir = f".tmp_{name.replace(' ', '_')}"
-
-        logging.info("Creating pod with:")
-        logging.info(f"  Name: {name}")
-        logging.info(f"  Image: {image_name}")
-        logging.info(f"  Network volume ID: {self._network_volume_id}")
-        logging.info(f"  Region: {self._region}")
-        logging.info(f"  GPU Type: {gpu_type}")
-        logging.info(f"  GPU Count: {num_gpus}")
-        logging.info(f"  Disk: {disk} GB")
-        logging.info(f"  Min CPU: {cpus}")
-        logging.info(f"  Min Memory: {memory} GB")
-        logging.info(f"  runpodcli directory: {runpodcli_dir}")
-        logging.info(f"  Time limit: {runtime} minutes")
-
-        git_email = os.getenv("GIT_EMAIL", "")
-        git_name = os.getenv("GIT_NAME", "")
+        name = name or f"{self._user}-{gpu_name}"
+        runpodcli_dir = f".tmp_{_UNSAFE_NAME_CHARS_RE.sub('_', name)}"
+        if shlex.quote(volume_mount_path) != volume_mount_path:
+            raise ValueError(f"volume_mount_path {volume_mount_path!r} must not contain spaces, quotes or other shell metacharacters")
+
+        logger.info("Creating pod with:")
+        logger.info("  Name: %s", name)
+        logger.info("  Image: %s", image_name)
+        logger.info("  Network volume ID: %s", self._network_volume_id)
+        logger.info("  Region: %s", self._region)
+        logger.info("  GPU Type: %s", gpu_type)
+        logger.info("  GPU Count: %s", num_gpus)
+        logger.info("  Disk: %s GB", disk)
+        logger.info("  Min CPU: %s", cpus)
+        logger.info("  Min Memory: %s GB", memory)
+        logger.info("  runpodcli directory: %s", runpodcli_dir)
+        logger.info("  Time limit: %s minutes", runtime)
+
         remote_scripts_path = f"{volume_mount_path}/{runpodcli_dir}"
         scripts = [
             get_setup_root(remote_scripts_path, volume_mount_path),
-            get_setup_user(remote_scripts_path, git_email, git_name),
+            get_setup_user(remote_scripts_path, self._git_email, self._git_name),
             get_start(remote_scripts_path),
             get_terminate(remote_scripts_path),
         ]
-        for script_name, script_content in scripts:
-            # s3_key is relative to /volume_mount_path, while remote_scripts_path is relative to /
-            s3_key = f"{runpodcli_dir}/{script_name}"
-            self._s3.put_object(Bucket=self._network_volume_id, Key=s3_key, Body=script_content.encode("utf-8"))
+        self._upload_scripts(runpodcli_dir, scripts)
+        if update_known_hosts:
+            # The scripts directory is reused by pods with the same name; drop the previous pod's host keys
+            self._delete_host_keys(runpodcli_dir)
 
         docker_args = self._build_docker_args(volume_mount_path=volume_mount_path, runpodcli_dir=runpodcli_dir, runtime=runtime)
 
-        pod = runpod.create_pod(
+        pod = self._runpod_call(
+            self._runpod.create_pod,
             name=name,
             image_name=image_name,
             gpu_type_id=gpu_id,
@@ -285,15 +686,22 @@ class RunPodManager:
             min_vcpu_count=cpus,
             min_memory_in_gb=memory,
             docker_args=docker_args,
-            ports="8888/http,22/tcp",
+            ports=POD_PORTS,
             volume_mount_path=volume_mount_path,
             network_volume_id=self._network_volume_id,
         )
 
         pod_id: str = pod.get("id")  # type: ignore
-        logging.info("Pod created. Provisioning...")
+        self._invalidate_pods_cache()
+        logger.info("Pod created. Provisioning...")
+        if update_known_hosts:
+            # Open a connection for the host-key download in the background, without ever waiting on it: the
+            # provisioning poll stays on the main thread so Ctrl-C still aborts immediately
+            warm_up = ThreadPoolExecutor(max_workers=1)
+            warm_up.submit(self._warm_s3_connection)
+            warm_up.shutdown(wait=False)
         pod = self._provision_and_wait(pod_id)
-        logging.info("Pod provisioned.")
+        logger.info("Pod provisioned.")
 
         ip, port = self._get_public_ip_and_port(pod)
 
@@ -301,44 +709,108 @@ class RunPodManager:
             self._write_ssh_config(ip, port, forward_agent)
 
         if update_known_hosts:
-            time.sleep(5)
+            self._wait_for_host_key(runpodcli_dir)
             self._update_known_hosts_file(ip, port, runpodcli_dir)
 
     def _generate_ssh_config(self, ip: str, port: int, forward_agent: bool = False) -> str:
-        return textwrap.dedent(f"""
-            Host runpod
-              HostName {ip}
-              User user
-              Port {port}
-              UserKnownHostsFile ~/.ssh/known_hosts ~/.ssh/known_hosts.runpod_cli
-              {"ForwardAgent yes" if forward_agent else ""}
-        """).strip()
+        return SSH_CONFIG_TEMPLATE.format(ip=ip, port=port, forward_agent="\n  ForwardAgent yes" if forward_agent else "")
 
     def _write_ssh_config(self, ip: str, port: int, forward_agent: bool, config_path: str = "~/.ssh/config.runpod_cli") -> None:
         runpod_config = self._generate_ssh_config(ip=ip, port=port, forward_agent=forward_agent)
-        with open(os.path.expanduser(config_path), "w") as f:
+        with open(expanduser(config_path), "w") as f:
             f.write(runpod_config)
-        logging.info(f"SSH config at {config_path} updated")
+        logger.info("SSH config at %s updated", config_path)
+
+    def _upload_scripts(self, runpodcli_dir: str, scripts: List[Tuple[str, str]]) -> None:
+        # One PUT for all scripts; the docker command unpacks the archive into remote_scripts_path
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as archive:
+            for script_name, script_content in scripts:
+                data = script_content.encode("utf-8")
+                info = tarfile.TarInfo(script_name)
+                info.size = len(data)
+                info.mode = 0o644
+                info.mtime = int(time.time())
+                archive.addfile(info, io.BytesIO(data))
+        # s3_key is relative to /volume_mount_path, while remote_scripts_path is relative to /
+        s3_key = f"{runpodcli_dir}/{SCRIPTS_ARCHIVE}"
+        self._s3.put_object(Bucket=self._network_volume_id, Key=s3_key, Body=buffer.getvalue())
+
+    def _warm_s3_connection(self) -> None:
+        try:
+            self._s3.list_objects_v2(Bucket=self._network_volume_id, MaxKeys=1)
+        except Exception as e:
+            logger.debug("S3 warm-up request failed: %s", e)
+
+    def _delete_host_keys(self, runpodcli_dir: str) -> None:
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        def delete(file: str) -> None:
+            try:
+                self._s3.delete_object(Bucket=self._network_volume_id, Key=f"{runpodcli_dir}/{file}")
+            except (ClientError, BotoCoreError) as e:
+                logger.warning("Could not delete stale %s: %s", file, e)
+
+        with ThreadPoolExecutor(max_workers=len(HOST_KEY_FILES)) as executor:
+            list(executor.map(delete, HOST_KEY_FILES))
+
+    def _host_key_exists(self, runpodcli_dir: str, file: str) -> bool:
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            self._s3.head_object(Bucket=self._network_volume_id, Key=f"{runpodcli_dir}/{file}")
+            return True
+        except (ClientError, BotoCoreError) as e:
+            logger.debug("Checking for %s failed: %s", file, e)
+            return False
+
+    def _wait_for_host_key(self, runpodcli_dir: str, timeout: float = 5.0) -> None:
+        # start_pod.sh copies the ed25519 key last, so once it exists the other keys are complete too. Nothing is
+        # written if $PUBLIC_KEY is unset or the image ships its own keys, so never wait longer than the fixed delay
+        # this replaced
+        try:
+            poll_with_backoff(lambda: self._host_key_exists(runpodcli_dir, "ssh_ed25519_host_key"), ready=bool, cap=2.0, max_total=timeout)
+        except TimeoutError:
+            logger.debug("ssh_ed25519_host_key did not appear within %s seconds", timeout)
+
+    def _get_host_key(self, runpodcli_dir: str, file: str) -> Optional[Tuple[str, str]]:
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            # Public host keys are well under 2 KiB; the range caps the response regardless
+            obj = self._s3.get_object(Bucket=self._network_volume_id, Key=f"{runpodcli_dir}/{file}", Range="bytes=0-2047")
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            host_key_text = ("".join(decoder.decode(chunk) for chunk in obj["Body"].iter_chunks()) + decoder.decode(b"", final=True)).strip()
+            # Host key files look like "<alg> <key> <comment>"; the comment is not needed
+            alg, _, rest = host_key_text.partition(" ")
+            key = rest.partition(" ")[0]
+            if not alg or not key:
+                return None
+            return alg, key
+        except ClientError:
+            # Missing (or empty) key file: that algorithm wasn't generated on the pod
+            return None
+        except BotoCoreError as e:
+            # Network trouble must not abort create() after the pod already exists
+            logger.warning("Could not download %s: %s", file, e)
+            return None
 
     def _update_known_hosts_file(self, public_ip: str, port: int, runpodcli_dir: str) -> None:
-        host_keys: List[Tuple[str, str]] = []
-        for file in ["ssh_ed25519_host_key", "ssh_ecdsa_host_key", "ssh_rsa_host_key", "ssh_dsa_host_key"]:
-            try:
-                obj = self._s3.get_object(Bucket=self._network_volume_id, Key=f"{runpodcli_dir}/{file}")
-                host_key_text = obj["Body"].read().decode("utf-8").strip()
-                alg, key, _ = host_key_text.split(" ")
-                host_keys.append((alg, key))
-            except Exception:
-                continue
-
-        known_hosts_path = os.path.expanduser("~/.ssh/known_hosts.runpod_cli")
-        for alg, key in host_keys:
-            try:
-                with open(known_hosts_path, "a") as dest:
-                    dest.write(f"# runpod cli:\n[{public_ip}]:{port} {alg} {key}\n")
-                logging.info(f"Added {alg} host key to {known_hosts_path}")
-            except Exception as e:
-                logging.error(f"Error adding host key: {e}")
+        with ThreadPoolExecutor(max_workers=len(HOST_KEY_FILES)) as executor:
+            results = list(executor.map(lambda file: self._get_host_key(runpodcli_dir, file), HOST_KEY_FILES))
+        host_keys: List[Tuple[str, str]] = [host_key for host_key in results if host_key is not None]
+
+        known_hosts_path = expanduser("~/.ssh/known_hosts.runpod_cli")
+        if not host_keys:
+            logger.warning("No SSH host keys found in %s, %s not updated", runpodcli_dir, known_hosts_path)
+            return
+        payload = "".join(f"# runpod cli:\n[{public_ip}]:{port} {alg} {key}\n" for alg, key in host_keys)
+        try:
+            with open(known_hosts_path, "a") as dest:
+                dest.write(payload)
+            logger.info("Added %d host key(s) (%s) to %s", len(host_keys), ", ".join(alg for alg, _ in host_keys), known_hosts_path)
+        except Exception as e:
+            logger.error("Error adding host key: %s", e)
 
     def terminate(self, pod_id: str) -> None:
         """Terminate a specific RunPod instance.
@@ -349,11 +821,37 @@ class RunPodManager:
         Example:
             rpc terminate --pod_id=abc123
         """
-        logging.info(f"Terminating pod {pod_id}")
-        _ = runpod.terminate_pod(pod_id)
+        logger.info("Terminating pod %s", pod_id)
+        attempts = 0
+
+        def terminate_once() -> None:
+            nonlocal attempts
+            attempts += 1
+            try:
+                # A single mutation over the shared session; the runpod SDK is only imported if it reports an error
+                self._graphql(POD_TERMINATE_MUTATION, {"podId": pod_id})
+            except self._runpod.error.QueryError as e:
+                # An earlier attempt may have timed out after the server already terminated the pod
+                if attempts > 1 and "not found" in str(e).lower():
+                    logger.info("Pod %s is already gone", pod_id)
+                    return
+                raise
+
+        self._runpod_query(terminate_once)
+        self._invalidate_pods_cache()
 
 
 def main():
+    import fire
+
+    level_name = (os.getenv("RUNPOD_CLI_LOG") or "INFO").upper()
+    # getLevelName maps known names to their number and returns a "Level X" string otherwise
+    level = logging.getLevelName(level_name)
+    logging.basicConfig(
+        level=level if isinstance(level, int) else logging.INFO, format="[%(levelname)s] %(asctime)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+    )
+    if not isinstance(level, int):
+        logger.warning("Unknown RUNPOD_CLI_LOG level %r, using INFO", level_name)
     fire.Fire(RunPodManager)
 
 
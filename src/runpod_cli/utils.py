@@ -1,5 +1,8 @@
+import functools
+import re
+import shlex
 import textwrap
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 
 # Default Docker image for pods
 DEFAULT_IMAGE_NAME = "runpod/pytorch:2.8.0-py3.11-cuda12.8.1-cudnn-devel-ubuntu22.04"
@@ -44,13 +47,29 @@ GPU_DISPLAY_NAME_TO_ID = {
     "Tesla V100": "Tesla V100-PCIE-16GB",
     "V100 SXM2": "Tesla V100-SXM2-16GB",
 }
-GPU_ID_TO_DISPLAY_NAME = {v: k for k, v in GPU_DISPLAY_NAME_TO_ID.items()}
 
 
-# Shell scripts to load onto the pod
-def get_setup_root(runpodcli_path: str, volume_mount_path: str) -> Tuple[str, str]:
-    return "setup_root.sh", textwrap.dedent(
-        r"""
+# Reverse mapping, only built the first time an ID is looked up
+@functools.lru_cache(maxsize=1)
+def _gpu_id_to_display_name() -> Dict[str, str]:
+    return {v: k for k, v in GPU_DISPLAY_NAME_TO_ID.items()}
+
+
+def get_gpu_display_name(gpu_id: str) -> Optional[str]:
+    return _gpu_id_to_display_name().get(gpu_id)
+
+
+# Shell scripts to load onto the pod. Templates are dedented once at import; placeholders are filled in a single pass.
+# Values are shell-quoted, so placeholders must only appear where an unquoted shell word is expected.
+_PLACEHOLDER_RE = re.compile(r"RUNPODCLI_PATH|VOLUME_MOUNT_PATH|GIT_EMAIL|GIT_NAME")
+
+
+def _fill(template: str, **values: str) -> str:
+    return _PLACEHOLDER_RE.sub(lambda match: shlex.quote(values[match.group(0)]) if match.group(0) in values else match.group(0), template)
+
+
+_SETUP_ROOT_SCRIPT = textwrap.dedent(
+    r"""
         #!/bin/bash
         exec >> RUNPODCLI_PATH/log.txt 2>&1 # logging
         echo "=== $(date -Iseconds) setup_root.sh ==="
@@ -81,13 +100,16 @@ def get_setup_root(runpodcli_path: str, volume_mount_path: str) -> Tuple[str, st
         ln -s RUNPODCLI_PATH/terminate_pod.sh /usr/local/bin/terminate_pod
 
         echo "...system setup completed!"
-    """.replace("RUNPODCLI_PATH", runpodcli_path).replace("VOLUME_MOUNT_PATH", volume_mount_path)
-    )
+    """
+)
 
 
-def get_setup_user(runpodcli_path: str, git_email: str, git_name: str) -> Tuple[str, str]:
-    return "setup_user.sh", textwrap.dedent(
-        r"""
+def get_setup_root(runpodcli_path: str, volume_mount_path: str) -> Tuple[str, str]:
+    return "setup_root.sh", _fill(_SETUP_ROOT_SCRIPT, RUNPODCLI_PATH=runpodcli_path, VOLUME_MOUNT_PATH=volume_mount_path)
+
+
+_SETUP_USER_SCRIPT = textwrap.dedent(
+    r"""
         #!/bin/bash
         exec >> RUNPODCLI_PATH/log.txt 2>&1 # logging
         echo "=== $(date -Iseconds) setup_user.sh ==="
@@ -95,8 +117,8 @@ def get_setup_user(runpodcli_path: str, git_email: str, git_name: str) -> Tuple[
         echo "Setting up user environment..."
 
         # Git configuration
-        git config --global user.email "GIT_EMAIL"
-        git config --global user.name "GIT_NAME"
+        git config --global user.email GIT_EMAIL
+        git config --global user.name GIT_NAME
         git config --global init.defaultBranch main
 
         # Install Node.js and npm packages
@@ -131,15 +153,16 @@ def get_setup_user(runpodcli_path: str, git_email: str, git_name: str) -> Tuple[
         python_version=$(python --version | cut -d' ' -f2 | cut -d'.' -f1-2)
         uv venv ~/.venv --python $python_version --system-site-packages
         echo "...user setup completed!"
-    """.replace("RUNPODCLI_PATH", runpodcli_path)
-        .replace("GIT_EMAIL", git_email)
-        .replace("GIT_NAME", git_name)
-    )
+    """
+)
 
 
-def get_start(runpodcli_path: str) -> Tuple[str, str]:
-    return "start_pod.sh", textwrap.dedent(
-        r"""
+def get_setup_user(runpodcli_path: str, git_email: str, git_name: str) -> Tuple[str, str]:
+    return "setup_user.sh", _fill(_SETUP_USER_SCRIPT, RUNPODCLI_PATH=runpodcli_path, GIT_EMAIL=git_email, GIT_NAME=git_name)
+
+
+_START_SCRIPT = textwrap.dedent(
+    r"""
         #!/bin/bash
         # Adapted from https://github.com/runpod/containers/blob/main/container-template/start_pod.sh
 
@@ -201,16 +224,19 @@ def get_start(runpodcli_path: str) -> Tuple[str, str]:
         setup_ssh
         export_env_vars
         bash RUNPODCLI_PATH/setup_root.sh
-        su -c "bash RUNPODCLI_PATH/setup_user.sh" user
+        su -c "bash $(printf %q RUNPODCLI_PATH/setup_user.sh)" user
 
         echo "Start script(s) finished, pod is ready to use."
-    """.replace("RUNPODCLI_PATH", runpodcli_path)
-    )
+    """
+)
 
 
-def get_terminate(runpodcli_path: str) -> Tuple[str, str]:
-    return "terminate_pod.sh", textwrap.dedent(
-        r"""
+def get_start(runpodcli_path: str) -> Tuple[str, str]:
+    return "start_pod.sh", _fill(_START_SCRIPT, RUNPODCLI_PATH=runpodcli_path)
+
+
+_TERMINATE_SCRIPT = textwrap.dedent(
+    r"""
         #!/bin/bash
         exec >> RUNPODCLI_PATH/log.txt | tee -a RUNPODCLI_PATH/log.txt 2>&1 # logging
         echo "=== $(date -Iseconds) terminate_pod.sh ==="
@@ -229,5 +255,9 @@ def get_terminate(runpodcli_path: str) -> Tuple[str, str]:
         --header 'content-type: application/json' \
         --url "https://api.runpod.io/graphql?api_key=${RUNPOD_API_KEY}" \
         --data "{\"query\": \"mutation { podTerminate(input: {podId: \\\"${RUNPOD_POD_ID}\\\"}) }\"}"
-    """.replace("RUNPODCLI_PATH", runpodcli_path)
-    )
+    """
+)
+
+
+def get_terminate(runpodcli_path: str) -> Tuple[str, str]:
+    return "terminate_pod.sh", _fill(_TERMINATE_SCRIPT, RUNPODCLI_PATH=runpodcli_path)